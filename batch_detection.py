@@ -0,0 +1,223 @@
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+
+from detectors import (collect_images, create_engine, create_ocr_reader, missing_ocr_models, EASYOCR_MODEL_DIR,
+                       OCR_CANVAS_SIZE, OCR_MAG_RATIO, OCR_SCALE, TARGET_ICON_NAME, TEMPLATE_MATCH_THRESHOLD)
+
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+DEFAULT_OUTPUT = "detections.jsonl"
+DEFAULT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "notepad_icon.png")
+
+# Engine built once per worker process by _init_worker, reused for every image
+_engine = None
+_engine_name = None
+_engine_settings = None
+_engine_error = None
+
+
+def engine_settings(engine_name, options):
+    """Return the options that change an engine's results, stored with every record."""
+    if engine_name == "template":
+        template_path = options.get("template_path")
+        return {"template_path": os.path.abspath(template_path) if template_path else None,
+                "threshold": options.get("threshold", TEMPLATE_MATCH_THRESHOLD)}
+    return {"target": options.get("target", TARGET_ICON_NAME),
+            "ocr_scale": options.get("ocr_scale", OCR_SCALE),
+            "ocr_canvas_size": options.get("ocr_canvas_size", OCR_CANVAS_SIZE),
+            "ocr_mag_ratio": options.get("ocr_mag_ratio", OCR_MAG_RATIO)}
+
+
+def check_engine(engine_name, options):
+    """Fail fast on a bad template or a missing OCR install without building the engine in this process."""
+    if engine_name == "template":
+        template_path = options.get("template_path")
+        if not template_path:
+            raise ValueError("The template engine needs a template image path")
+        if cv2.imread(template_path, cv2.IMREAD_COLOR) is None:
+            raise FileNotFoundError(f"Failed to load template image: {template_path}")
+    elif engine_name == "ocr":
+        if importlib.util.find_spec("easyocr") is None:
+            raise ImportError("EasyOCR is not installed")
+        if missing_ocr_models():
+            # Download once before the workers start, in a fresh process so torch never loads here
+            print(f"Downloading EasyOCR models to {EASYOCR_MODEL_DIR}...")
+            process = multiprocessing.get_context("spawn").Process(target=create_ocr_reader)
+            process.start()
+            process.join()
+            missing = missing_ocr_models()
+            if process.exitcode != 0 or missing:
+                raise RuntimeError(f"EasyOCR models could not be loaded: {', '.join(missing) or 'reader failed'}")
+    else:
+        raise ValueError(f"Unknown detection engine: {engine_name}")
+
+
+def load_completed(output_path, engine_name, settings):
+    """Return the images already recorded in output_path for this engine and settings.
+
+    A partially written last line is dropped. Records made with another engine
+    or other settings do not count, so rerunning with e.g. a new threshold
+    processes every image again.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        good_end = data.rfind(b"\n") + 1
+        if good_end < len(data):
+            print(f"Discarding partially written record at the end of {output_path}")
+            f.truncate(good_end)
+
+    for line in data[:good_end].decode("utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        # Failed images are retried on the next run
+        if ("image" in record and not record.get("error") and record.get("engine") == engine_name
+                and record.get("settings") == settings):
+            completed.add(record["image"])
+    return completed
+
+
+def _init_worker(engine_name, options):
+    global _engine, _engine_name, _engine_settings, _engine_error
+    _engine_name = engine_name
+    _engine_settings = engine_settings(engine_name, options)
+    # One core per worker: let the pool do the parallelism instead of OpenCV/torch threads
+    cv2.setNumThreads(1)
+    if engine_name == "ocr":
+        try:
+            import torch
+            torch.set_num_threads(1)
+        except ImportError:
+            pass
+    # An initializer that raises makes the pool respawn the worker forever, so keep the error for _detect_image
+    try:
+        _engine = create_engine(engine_name, **options)
+    except Exception as e:
+        _engine_error = f"engine failed to start: {e}"
+
+
+def _detect_image(path):
+    start = time.perf_counter()
+    record = {"image": path, "engine": _engine_name, "settings": _engine_settings, "pid": os.getpid()}
+    try:
+        if _engine is None:
+            raise RuntimeError(_engine_error)
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("could not read image")
+        load_ms = (time.perf_counter() - start) * 1000
+
+        result = _engine.detect(image)
+        record.update(result)
+        record["load_ms"] = round(load_ms, 2)
+    except Exception as e:
+        record["found"] = False
+        record["error"] = str(e)
+    record["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def run_batch(source, output_path=DEFAULT_OUTPUT, engine_name="ocr", target=TARGET_ICON_NAME,
+              template_path=None, threshold=TEMPLATE_MATCH_THRESHOLD, workers=None, chunksize=4,
+              ocr_scale=OCR_SCALE, ocr_canvas_size=OCR_CANVAS_SIZE, ocr_mag_ratio=OCR_MAG_RATIO):
+    if engine_name == "template":
+        template_path = template_path or DEFAULT_TEMPLATE_PATH
+    options = {"target": target, "template_path": template_path, "threshold": threshold,
+               "ocr_scale": ocr_scale, "ocr_canvas_size": ocr_canvas_size, "ocr_mag_ratio": ocr_mag_ratio}
+
+    images = collect_images(source)
+    completed = load_completed(output_path, engine_name, engine_settings(engine_name, options))
+    pending = [p for p in images if p not in completed]
+    workers = workers or os.cpu_count() or 1
+
+    print(f"Found {len(images)} images, {len(images) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return {"processed": 0, "found": 0, "errors": 0, "seconds": 0.0}
+
+    # Fail fast on a bad template or a missing OCR model instead of in every worker
+    check_engine(engine_name, options)
+
+    print(f"Starting {workers} '{engine_name}' workers...")
+    start = time.perf_counter()
+    processed = found = errors = 0
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(engine_name, options)) as pool:
+            for record in pool.imap_unordered(_detect_image, pending, chunksize=chunksize):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+                processed += 1
+                found += 1 if record.get("found") else 0
+                errors += 1 if record.get("error") else 0
+                if processed % 50 == 0 or processed == len(pending):
+                    rate = processed / (time.perf_counter() - start)
+                    print(f"  {processed}/{len(pending)} images ({rate:.1f} images/s)")
+
+    seconds = time.perf_counter() - start
+    return {"processed": processed, "found": found, "errors": errors, "seconds": round(seconds, 2)}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run icon detection offline over a directory or glob of screenshots.")
+    parser.add_argument("source", help="Directory of screenshots or a glob pattern such as 'archive/**/*.png'")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="JSON Lines file to append results to")
+    parser.add_argument("-e", "--engine", choices=["ocr", "template"], default="ocr")
+    parser.add_argument("-t", "--target", default=TARGET_ICON_NAME, help="Text to look for with the OCR engine")
+    parser.add_argument("--template", default=None, help="Template image for the template engine")
+    parser.add_argument("--threshold", type=float, default=TEMPLATE_MATCH_THRESHOLD,
+                        help="Confidence threshold for the template engine")
+    parser.add_argument("--ocr-scale", type=float, default=OCR_SCALE,
+                        help="Run OCR text detection on screenshots downscaled by this factor")
+    parser.add_argument("--canvas-size", type=int, default=OCR_CANVAS_SIZE,
+                        help="Max image side for OCR text detection (as in ocr_benchmark.py)")
+    parser.add_argument("--mag-ratio", type=float, default=OCR_MAG_RATIO,
+                        help="Magnification before OCR text detection (as in ocr_benchmark.py)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=4, help="Images handed to a worker at a time")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        args = parse_args()
+        print("=" * 60)
+        print("Icon Detection Tool - Batch Mode")
+        print("=" * 60)
+        print(f"Source: {args.source}")
+        print(f"Results: {args.output}")
+        print("=" * 60)
+
+        summary = run_batch(args.source, args.output, args.engine, args.target,
+                            args.template, args.threshold, args.workers, args.chunksize, args.ocr_scale,
+                            args.canvas_size, args.mag_ratio)
+
+        print("\n" + "=" * 60)
+        print(f"Processed {summary['processed']} images in {summary['seconds']}s")
+        print(f"Found: {summary['found']} | Errors: {summary['errors']}")
+        print("=" * 60)
+
+    except KeyboardInterrupt:
+        print("\n\nBatch detection stopped by user (rerun to resume)")
+    except Exception as e:
+        print(f"\n\nFatal error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,304 @@
+import difflib
+import glob
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cv2
+import numpy as np
+
+
+TARGET_ICON_NAME = "Notepad"
+TEMPLATE_SCALES = [1.0, 0.8, 1.2, 0.6, 1.4]
+TEMPLATE_MATCH_THRESHOLD = 0.7  # Confidence threshold for template matching
+TEMPLATE_CERTAIN_THRESHOLD = 0.95  # Stop searching other scales once a match is this good
+TEMPLATE_SCALE_WORKERS = min(len(TEMPLATE_SCALES), os.cpu_count() or 1)  # Scales matched in parallel
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+# Reduced-resolution OCR: detect text on a frame scaled by OCR_SCALE, re-read candidates at full size
+OCR_SCALE = 1.0  # Below 1.0 (e.g. 0.5), text detection runs on a downscaled screenshot
+OCR_CANVAS_SIZE = 2560  # Max image side EasyOCR's detector works at
+OCR_MAG_RATIO = 1.0  # Extra magnification before detection
+OCR_CANDIDATE_RATIO = 0.5
+OCR_MAX_CANDIDATES = 3
+EASYOCR_MODEL_DIR = os.path.join(os.path.expanduser("~"), ".EasyOCR", "model")
+EASYOCR_MODEL_FILES = ("craft_mlt_25k.pth", "english_g2.pth")  # Text detector and English recognizer
+
+# Thread pools for match_template_multiscale, one per worker count, reused across calls
+_scale_pools = {}
+_scale_pools_lock = threading.Lock()
+
+
+def create_ocr_reader(gpu=False):
+    """Create an EasyOCR reader with the same settings as the automation scripts."""
+    import easyocr
+
+    return easyocr.Reader(
+        ['en'],
+        verbose=False,
+        gpu=gpu,
+        download_enabled=True,
+        model_storage_directory=EASYOCR_MODEL_DIR
+    )
+
+
+def missing_ocr_models():
+    """Return the EasyOCR model files create_ocr_reader needs that are not downloaded yet."""
+    return [name for name in EASYOCR_MODEL_FILES if not os.path.exists(os.path.join(EASYOCR_MODEL_DIR, name))]
+
+
+def find_text(reader, image, target=TARGET_ICON_NAME, canvas_size=OCR_CANVAS_SIZE, mag_ratio=OCR_MAG_RATIO):
+    """Return (center_x, center_y, text, prob, bbox) of the first OCR hit containing target, or None."""
+    for (bbox, text, prob) in reader.readtext(image, canvas_size=canvas_size, mag_ratio=mag_ratio):
+        if target.lower() in text.lower():
+            return _hit(bbox, text, prob)
+    return None
+
+
+def _hit(bbox, text, prob):
+    top_left = bbox[0]
+    bottom_right = bbox[2]
+    center_x = int((top_left[0] + bottom_right[0]) / 2)
+    center_y = int((top_left[1] + bottom_right[1]) / 2)
+    return center_x, center_y, text, float(prob), bbox
+
+
+def _text_similarity(target, text):
+    target = target.lower()
+    text = text.lower()
+    if target in text:
+        return 1.0
+    return difflib.SequenceMatcher(None, target, text).ratio()
+
+
+def find_text_downscaled(reader, image, target=TARGET_ICON_NAME, scale=OCR_SCALE, canvas_size=OCR_CANVAS_SIZE,
+                         mag_ratio=OCR_MAG_RATIO, candidate_ratio=OCR_CANDIDATE_RATIO,
+                         max_candidates=OCR_MAX_CANDIDATES, stats=None):
+    """Like find_text, but runs EasyOCR's text detector on a frame downscaled by `scale`.
+
+    All boxes are read once at the reduced resolution; only those whose text looks
+    like the target are read again from the full-resolution frame. Pass a dict as
+    `stats` to get the number of boxes and candidates back.
+    """
+    if scale >= 1.0:
+        return find_text(reader, image, target, canvas_size, mag_ratio)
+
+    full_grey = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    small_grey = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    horizontal_list, free_list = reader.detect(small, canvas_size=canvas_size, mag_ratio=mag_ratio,
+                                               min_size=max(1, int(20 * scale)))
+    horizontal_list, free_list = horizontal_list[0], free_list[0]
+    if stats is not None:
+        stats["boxes"] = len(horizontal_list) + len(free_list)
+        stats["candidates"] = 0
+    if not horizontal_list and not free_list:
+        return None
+
+    candidates = []
+    for (bbox, text, prob) in reader.recognize(small_grey, horizontal_list, free_list):
+        similarity = _text_similarity(target, text)
+        if similarity >= candidate_ratio:
+            candidates.append((similarity, bbox))
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    candidates = candidates[:max_candidates]
+    if stats is not None:
+        stats["candidates"] = len(candidates)
+
+    # Map candidate boxes back to full resolution and read them again there
+    height, width = full_grey.shape[:2]
+    full_boxes = []
+    for _, bbox in candidates:
+        xs = [p[0] / scale for p in bbox]
+        ys = [p[1] / scale for p in bbox]
+        x_min, x_max = max(0, int(min(xs)) - 2), min(width, int(max(xs)) + 2)
+        y_min, y_max = max(0, int(min(ys)) - 2), min(height, int(max(ys)) + 2)
+        full_boxes.append([x_min, x_max, y_min, y_max])
+
+    for full_box in full_boxes:
+        for (bbox, text, prob) in reader.recognize(full_grey, [full_box], []):
+            if target.lower() in text.lower():
+                return _hit(bbox, text, prob)
+    return None
+
+
+def _match_at_scale(screenshot_np, template, scale):
+    width = int(template.shape[1] * scale)
+    height = int(template.shape[0] * scale)
+
+    if width < 10 or height < 10 or width > screenshot_np.shape[1] or height > screenshot_np.shape[0]:
+        return None
+
+    resized_template = cv2.resize(template, (width, height))
+    result = cv2.matchTemplate(screenshot_np, resized_template, cv2.TM_CCOEFF_NORMED)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    return float(max_val), max_loc, (width, height)
+
+
+def _get_scale_pool(workers):
+    # Several threads may search at once; without the lock their first calls could each create a pool
+    with _scale_pools_lock:
+        if workers not in _scale_pools:
+            _scale_pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="template-scale")
+        return _scale_pools[workers]
+
+
+def order_scales(scales, wins):
+    """Sort scales so the ones that matched most often come first, keeping the given order for ties."""
+    return sorted(scales, key=lambda scale: -wins.get(scale, 0))
+
+
+def match_template_multiscale(screenshot_np, template, scales=TEMPLATE_SCALES, certain=None, workers=1, stats=None):
+    """Return (confidence, location, (width, height)) of the best match over the given scales.
+
+    Scales are started in the order given, so put the likeliest first. With
+    workers > 1 they are matched on a shared thread pool (OpenCV releases the
+    GIL), at most `workers` at a time. When `certain` is set, the first scale
+    is tried on its own and the search only fans out if it falls short. Once a
+    match reaches `certain`, scales that have not started are cancelled; the
+    ones already running are waited for and count as evaluated. Pass a dict as
+    `stats` to get the number of scales evaluated, skipped (template too small
+    or too big) and cancelled, plus the winning scale.
+    """
+    scales = list(scales)
+    matches = {}
+
+    def is_certain(match):
+        return certain is not None and match is not None and match[0] >= certain
+
+    if workers > 1 and len(scales) > 1:
+        pending = list(range(len(scales)))
+        if certain is not None:
+            matches[0] = _match_at_scale(screenshot_np, template, scales[0])
+            pending = [] if is_certain(matches[0]) else pending[1:]
+
+        pool = _get_scale_pool(workers)
+        running = {}
+        while pending or running:
+            while pending and len(running) < workers:
+                i = pending.pop(0)
+                running[pool.submit(_match_at_scale, screenshot_np, template, scales[i])] = i
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                matches[i] = future.result()
+                if is_certain(matches[i]):
+                    pending = []
+    else:
+        for i, scale in enumerate(scales):
+            matches[i] = _match_at_scale(screenshot_np, template, scale)
+            if is_certain(matches[i]):
+                break
+    cancelled = len(scales) - len(matches)
+
+    best_confidence = 0
+    best_location = None
+    best_size = None
+    best_index = None
+    # Go through results in scale order so ties resolve the same way as a sequential search
+    for i in sorted(matches):
+        match = matches[i]
+        if match is not None and match[0] > best_confidence:
+            best_confidence, best_location, best_size = match
+            best_index = i
+
+    if stats is not None:
+        stats["evaluated"] = sum(1 for match in matches.values() if match is not None)
+        stats["skipped"] = sum(1 for match in matches.values() if match is None)
+        stats["cancelled"] = cancelled
+        stats["total"] = len(scales)
+        stats["scale"] = scales[best_index] if best_index is not None else None
+
+    return float(best_confidence), best_location, best_size
+
+
+class OcrEngine:
+    name = "ocr"
+
+    def __init__(self, target=TARGET_ICON_NAME, gpu=False, scale=OCR_SCALE, canvas_size=OCR_CANVAS_SIZE,
+                 mag_ratio=OCR_MAG_RATIO):
+        self.target = target
+        self.scale = scale
+        self.canvas_size = canvas_size
+        self.mag_ratio = mag_ratio
+        self.reader = create_ocr_reader(gpu=gpu)
+
+    def detect(self, image):
+        start = time.perf_counter()
+        hit = find_text_downscaled(self.reader, image, self.target, self.scale,
+                                   self.canvas_size, self.mag_ratio)
+        detect_ms = (time.perf_counter() - start) * 1000
+
+        if hit is None:
+            return {"found": False, "x": None, "y": None, "confidence": None,
+                    "text": None, "detect_ms": round(detect_ms, 2)}
+
+        center_x, center_y, text, prob, _ = hit
+        return {"found": True, "x": center_x, "y": center_y, "confidence": round(prob, 4),
+                "text": text, "detect_ms": round(detect_ms, 2)}
+
+
+class TemplateEngine:
+    name = "template"
+
+    def __init__(self, template_path, threshold=TEMPLATE_MATCH_THRESHOLD, scales=TEMPLATE_SCALES,
+                 certain=TEMPLATE_CERTAIN_THRESHOLD, workers=1):
+        self.template_path = template_path
+        self.threshold = threshold
+        self.scales = list(scales)
+        self.certain = certain
+        self.workers = workers
+        self.scale_wins = {}
+        self.template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+        if self.template is None:
+            raise FileNotFoundError(f"Failed to load template image: {template_path}")
+
+    def detect(self, image):
+        start = time.perf_counter()
+        stats = {}
+        confidence, location, size = match_template_multiscale(
+            image, self.template, order_scales(self.scales, self.scale_wins),
+            certain=self.certain, workers=self.workers, stats=stats
+        )
+        detect_ms = (time.perf_counter() - start) * 1000
+
+        if confidence < self.threshold or location is None:
+            return {"found": False, "x": None, "y": None, "confidence": round(confidence, 4),
+                    "text": None, "detect_ms": round(detect_ms, 2), "scales_evaluated": stats["evaluated"]}
+
+        self.scale_wins[stats["scale"]] = self.scale_wins.get(stats["scale"], 0) + 1
+        center_x = location[0] + size[0] // 2
+        center_y = location[1] + size[1] // 2
+        return {"found": True, "x": center_x, "y": center_y, "confidence": round(confidence, 4),
+                "text": None, "detect_ms": round(detect_ms, 2), "scales_evaluated": stats["evaluated"]}
+
+
+def create_engine(name, target=TARGET_ICON_NAME, template_path=None, threshold=TEMPLATE_MATCH_THRESHOLD,
+                  ocr_scale=OCR_SCALE, ocr_canvas_size=OCR_CANVAS_SIZE, ocr_mag_ratio=OCR_MAG_RATIO):
+    if name == "ocr":
+        return OcrEngine(target=target, scale=ocr_scale, canvas_size=ocr_canvas_size, mag_ratio=ocr_mag_ratio)
+    if name == "template":
+        if not template_path:
+            raise ValueError("The template engine needs a template image path")
+        return TemplateEngine(template_path, threshold=threshold)
+    raise ValueError(f"Unknown detection engine: {name}")
+
+
+def to_bgr(image):
+    """Convert an RGB screenshot (PIL image or array) to the BGR layout OpenCV expects."""
+    return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+
+
+def collect_images(source):
+    """Expand a directory (recursively) or a glob pattern into a sorted list of image paths."""
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(root, name))
+    else:
+        paths = [p for p in glob.glob(source, recursive=True)
+                 if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(os.path.abspath(p) for p in paths)
@@ -0,0 +1,379 @@
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from detectors import collect_images, create_engine, to_bgr, TARGET_ICON_NAME
+
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+MAX_SLOTS = 8
+MAX_CONSUMERS = 16
+POLL_INTERVAL = 0.001
+
+# Header layout (int64 fields) at the start of the shared memory block
+LATEST_SEQ = 0
+HEIGHT = 1
+WIDTH = 2
+CHANNELS = 3
+SLOTS = 4
+CONSUMERS = 5
+EVERY_FRAME = 6
+CLOSED = 7
+SLOT_SEQ = 8
+CONSUMER_ACK = SLOT_SEQ + MAX_SLOTS
+HEADER_FIELDS = CONSUMER_ACK + MAX_CONSUMERS
+HEADER_BYTES = ((HEADER_FIELDS * 8 + 63) // 64) * 64
+
+# Ack value for consumers that have exited, so they never hold back the producer
+ACK_DONE = 2 ** 62
+
+
+class FrameBus:
+    """Ring of BGR frame slots in shared memory, tagged with sequence numbers.
+
+    The producer copies each captured frame into the next slot once; readers get
+    numpy views straight onto the slot, so frames are never pickled or copied
+    between processes. A slot's sequence number is cleared while it is being
+    rewritten, which lets a reader check that its frame was not overwritten
+    while it was working on it.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self.shape = (int(self.header[HEIGHT]), int(self.header[WIDTH]), int(self.header[CHANNELS]))
+        self.slots = int(self.header[SLOTS])
+        self.consumers = int(self.header[CONSUMERS])
+        self.every_frame = bool(self.header[EVERY_FRAME])
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8,
+                                 buffer=shm.buf, offset=HEADER_BYTES)
+
+    @classmethod
+    def create(cls, shape, slots=3, consumers=1, every_frame=True):
+        if len(shape) == 2:
+            shape = (shape[0], shape[1], 1)
+        if not 1 <= slots <= MAX_SLOTS:
+            raise ValueError(f"slots must be between 1 and {MAX_SLOTS}")
+        if not 1 <= consumers <= MAX_CONSUMERS:
+            raise ValueError(f"consumers must be between 1 and {MAX_CONSUMERS}")
+
+        size = HEADER_BYTES + slots * int(np.prod(shape))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[HEIGHT], header[WIDTH], header[CHANNELS] = shape
+        header[SLOTS] = slots
+        header[CONSUMERS] = consumers
+        header[EVERY_FRAME] = 1 if every_frame else 0
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def closed(self):
+        return bool(self.header[CLOSED])
+
+    def latest_seq(self):
+        return int(self.header[LATEST_SEQ])
+
+    def publish(self, frame, timeout=None, on_wait=None):
+        """Copy frame into the next slot and return its sequence number.
+
+        In every-frame mode this waits for all consumers to release the slot,
+        calling on_wait (if given) on every poll, e.g. to notice dead consumers.
+        """
+        frame = frame.reshape(self.shape) if frame.ndim == 2 else frame
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match bus shape {self.shape}")
+
+        seq = self.latest_seq() + 1
+        slot = seq % self.slots
+
+        if self.every_frame:
+            # The slot still holds frame seq - slots; wait until every consumer is done with it
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self.consumers_done(seq - self.slots):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Consumers did not release frame {seq - self.slots}")
+                if on_wait:
+                    on_wait()
+                time.sleep(POLL_INTERVAL)
+
+        self.header[SLOT_SEQ + slot] = 0
+        np.copyto(self.frames[slot], frame)
+        self.header[SLOT_SEQ + slot] = seq
+        self.header[LATEST_SEQ] = seq
+        return seq
+
+    def read(self, after_seq, timeout=None):
+        """Wait for a frame newer than after_seq and return (seq, view), or None once the bus is closed.
+
+        In every-frame mode this is the frame right after after_seq, otherwise the latest one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            latest = self.latest_seq()
+            if latest > after_seq:
+                seq = after_seq + 1 if self.every_frame else latest
+                slot = seq % self.slots
+                if self.header[SLOT_SEQ + slot] == seq:
+                    return seq, self.frames[slot]
+            elif self.closed:
+                return None
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"No frame after {after_seq}")
+            time.sleep(POLL_INTERVAL)
+
+    def is_current(self, seq):
+        """True if the slot for seq still holds that frame (i.e. it was not overwritten meanwhile)."""
+        return int(self.header[SLOT_SEQ + seq % self.slots]) == seq
+
+    def ack(self, consumer_index, seq):
+        self.header[CONSUMER_ACK + consumer_index] = seq
+
+    def consumers_done(self, seq):
+        return int(self.header[CONSUMER_ACK:CONSUMER_ACK + self.consumers].min()) >= seq
+
+    def close_bus(self):
+        """Tell readers no more frames are coming."""
+        self.header[CLOSED] = 1
+
+    def close(self):
+        # Views must be released before the underlying buffer can be closed
+        del self.header
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ScreenSource:
+    """Live frames from the desktop."""
+
+    def __init__(self, count=None, interval=0.0):
+        self.count = count
+        self.interval = interval
+
+    def __iter__(self):
+        import pyautogui
+
+        captured = 0
+        while self.count is None or captured < self.count:
+            yield to_bgr(pyautogui.screenshot())
+            captured += 1
+            time.sleep(self.interval)
+
+
+class ReplaySource:
+    """Frames replayed from screenshot files (a directory or glob), for offline runs and tests.
+
+    The bus has a fixed frame size, taken from the first image. Images of another
+    size are skipped, or resized to it when `resize` is set.
+    """
+
+    def __init__(self, source, loops=1, resize=False):
+        self.paths = collect_images(source)
+        self.loops = loops
+        self.resize = resize
+        self.shape = None
+        if not self.paths:
+            raise ValueError(f"No images found in {source}")
+
+    def __iter__(self):
+        for _ in range(self.loops):
+            for path in self.paths:
+                frame = cv2.imread(path, cv2.IMREAD_COLOR)
+                if frame is None:
+                    print(f"Skipping unreadable image: {path}")
+                    continue
+                if self.shape is None:
+                    self.shape = frame.shape
+                elif frame.shape != self.shape:
+                    if not self.resize:
+                        print(f"Skipping {path}: size {frame.shape[1]}x{frame.shape[0]} "
+                              f"does not match {self.shape[1]}x{self.shape[0]}")
+                        continue
+                    print(f"Resizing {path} to {self.shape[1]}x{self.shape[0]}")
+                    frame = cv2.resize(frame, (self.shape[1], self.shape[0]), interpolation=cv2.INTER_AREA)
+                yield frame
+
+
+def detector_worker(bus_name, consumer_index, detector, results):
+    """Run one engine over frames from the bus and publish result records on the results queue."""
+    cv2.setNumThreads(1)
+    bus = FrameBus.attach(bus_name)
+    options = dict(detector)
+    engine_name = options.pop("engine")
+    frame = view = None
+    try:
+        engine = create_engine(engine_name, **options)
+        last_seq = 0
+        while True:
+            frame = bus.read(last_seq)
+            if frame is None:
+                break
+            seq, view = frame
+
+            record = {"seq": seq, "consumer": consumer_index, "engine": engine_name, "pid": os.getpid(),
+                      "target": options.get("template_path") or options.get("target", TARGET_ICON_NAME)}
+            record.update(engine.detect(view))
+            if not bus.is_current(seq):
+                record["stale"] = True
+            frame = view = None
+
+            results.put(record)
+            bus.ack(consumer_index, seq)
+            last_seq = seq
+    except Exception as e:
+        results.put({"consumer": consumer_index, "engine": engine_name, "error": str(e)})
+    finally:
+        # Drop our views of the shared buffer before closing it
+        frame = view = None
+        bus.ack(consumer_index, ACK_DONE)
+        results.put({"consumer": consumer_index, "done": True})
+        bus.close()
+
+
+def run_frame_bus(source, detectors, slots=3, every_frame=True, on_result=None):
+    """Publish frames from source to one worker process per detector and collect their results.
+
+    detectors is a list of engine specs, e.g. {"engine": "ocr", "target": "Notepad"} or
+    {"engine": "template", "template_path": "templates/notepad_icon.png"}.
+    """
+    frames = iter(source)
+    try:
+        first = next(frames)
+    except StopIteration:
+        return []
+
+    bus = FrameBus.create(first.shape, slots=slots, consumers=len(detectors), every_frame=every_frame)
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=detector_worker, args=(bus.name, i, detector, results), daemon=True)
+               for i, detector in enumerate(detectors)]
+    for worker in workers:
+        worker.start()
+
+    collected = []
+    done = 0
+    exited = set()
+
+    def drain(block=False):
+        nonlocal done
+        while True:
+            try:
+                record = results.get(timeout=0.1) if block else results.get_nowait()
+            except queue.Empty:
+                return
+            if record.get("done"):
+                done += 1
+                continue
+            collected.append(record)
+            if on_result:
+                on_result(record)
+            if block:
+                return
+
+    def reap():
+        # A worker killed outright (OOM, segfault) never acks ACK_DONE itself and would stall the producer
+        for i, worker in enumerate(workers):
+            if i in exited or worker.exitcode is None:
+                continue
+            exited.add(i)
+            bus.ack(i, ACK_DONE)
+            if worker.exitcode != 0:
+                record = {"consumer": i, "engine": detectors[i]["engine"],
+                          "error": f"detector process exited with code {worker.exitcode}"}
+                collected.append(record)
+                if on_result:
+                    on_result(record)
+
+    def wait_step():
+        drain()
+        reap()
+
+    try:
+        seq = bus.publish(first, on_wait=wait_step)
+        for frame in frames:
+            drain()
+            seq = bus.publish(frame, on_wait=wait_step)
+        while every_frame and not bus.consumers_done(seq):
+            drain(block=True)
+            reap()
+    finally:
+        bus.close_bus()
+        while done < len(workers) and any(w.is_alive() for w in workers):
+            drain(block=True)
+        drain()
+        for worker in workers:
+            worker.join()
+        bus.close()
+
+    return collected
+
+
+def parse_detector(spec):
+    """Parse 'ocr:Notepad' or 'template:templates/notepad_icon.png' into an engine spec."""
+    engine, _, value = spec.partition(":")
+    if engine == "ocr":
+        return {"engine": "ocr", "target": value} if value else {"engine": "ocr"}
+    if engine == "template":
+        return {"engine": "template", "template_path": value}
+    raise argparse.ArgumentTypeError(f"Unknown detector '{spec}' (use ocr[:TEXT] or template:PATH)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate several detectors on the same frames via shared memory.")
+    parser.add_argument("source", nargs="?", help="Directory or glob of screenshots to replay (omit to capture the screen)")
+    parser.add_argument("-d", "--detector", type=parse_detector, action="append", required=True,
+                        help="ocr[:TEXT] or template:PATH, may be repeated")
+    parser.add_argument("-n", "--frames", type=int, default=1, help="Frames to capture in screen mode")
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--resize", action="store_true",
+                        help="Resize replayed screenshots to the first one's size instead of skipping them")
+    parser.add_argument("--latest-only", action="store_true", help="Let slow detectors skip to the newest frame")
+    args = parser.parse_args()
+
+    try:
+        source = ReplaySource(args.source, resize=args.resize) if args.source else ScreenSource(count=args.frames)
+
+        def show(record):
+            if record.get("error"):
+                print(f"❌ [{record['engine']}] {record['error']}")
+            elif record.get("found"):
+                print(f"✅ frame {record['seq']} [{record['engine']}] found at ({record['x']}, {record['y']}) "
+                      f"confidence {record['confidence']:.2f} in {record['detect_ms']:.0f} ms")
+            else:
+                print(f"   frame {record['seq']} [{record['engine']}] not found ({record['detect_ms']:.0f} ms)")
+
+        start = time.perf_counter()
+        records = run_frame_bus(source, args.detector, slots=args.slots,
+                                every_frame=not args.latest_only, on_result=show)
+        print(f"\n{len(records)} results in {time.perf_counter() - start:.2f}s")
+
+    except KeyboardInterrupt:
+        print("\n\nFrame bus stopped by user")
+    except Exception as e:
+        print(f"\n\nFatal error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,138 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import cv2
+
+from detectors import (collect_images, create_ocr_reader, find_text, find_text_downscaled,
+                       OCR_CANVAS_SIZE, OCR_MAG_RATIO, TARGET_ICON_NAME)
+
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+DEFAULT_SCALES = [1.0, 0.75, 0.5, 0.33, 0.25]
+DEFAULT_TOLERANCE = 20  # Max distance in pixels from the full-resolution hit to count as correct
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+def run_benchmark(paths, scales=DEFAULT_SCALES, target=TARGET_ICON_NAME, canvas_size=OCR_CANVAS_SIZE,
+                  mag_ratio=OCR_MAG_RATIO, tolerance=DEFAULT_TOLERANCE):
+    """Compare reduced-resolution OCR against plain full-resolution readtext on the same screenshots.
+
+    The full-resolution result is taken as the reference: a scale is correct on an
+    image when it finds the target within `tolerance` pixels of the reference hit,
+    or when neither finds it.
+    """
+    print("Initializing EasyOCR (this may take a moment)...")
+    reader = create_ocr_reader()
+
+    baseline_ms = []
+    rows = {scale: {"ms": [], "correct": 0, "hits": 0, "reference_hits": 0, "candidates": []} for scale in scales}
+    warmed_up = False
+
+    for n, path in enumerate(paths, 1):
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            print(f"Skipping unreadable image: {path}")
+            continue
+        if not warmed_up:
+            find_text(reader, image, target)
+            warmed_up = True
+
+        start = time.perf_counter()
+        reference = find_text(reader, image, target)
+        baseline_ms.append((time.perf_counter() - start) * 1000)
+
+        for scale in scales:
+            stats = {}
+            start = time.perf_counter()
+            hit = find_text_downscaled(reader, image, target, scale=scale, canvas_size=canvas_size,
+                                       mag_ratio=mag_ratio, stats=stats)
+            row = rows[scale]
+            row["ms"].append((time.perf_counter() - start) * 1000)
+            if "candidates" in stats:
+                row["candidates"].append(stats["candidates"])
+
+            if reference is None:
+                row["correct"] += 1 if hit is None else 0
+            else:
+                row["reference_hits"] += 1
+                if hit is not None and math.hypot(hit[0] - reference[0], hit[1] - reference[1]) <= tolerance:
+                    row["correct"] += 1
+                    row["hits"] += 1
+
+        print(f"  {n}/{len(paths)} {os.path.basename(path)}")
+
+    images = len(baseline_ms)
+    baseline_mean = sum(baseline_ms) / images if images else 0.0
+    summary = []
+    for scale in scales:
+        row = rows[scale]
+        mean_ms = sum(row["ms"]) / len(row["ms"]) if row["ms"] else 0.0
+        summary.append({
+            "scale": scale,
+            "mean_ms": round(mean_ms, 1),
+            "p95_ms": round(percentile(row["ms"], 0.95), 1),
+            "speedup": round(baseline_mean / mean_ms, 2) if mean_ms else 0.0,
+            "accuracy": round(row["correct"] / images, 3) if images else 0.0,
+            "recall": round(row["hits"] / row["reference_hits"], 3) if row["reference_hits"] else None,
+            "avg_candidates": round(sum(row["candidates"]) / len(row["candidates"]), 2) if row["candidates"] else None,
+        })
+    return round(baseline_mean, 1), summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure OCR accuracy and latency per downscale factor.")
+    parser.add_argument("source", help="Directory of screenshots or a glob pattern")
+    parser.add_argument("-s", "--scales", type=float, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("-t", "--target", default=TARGET_ICON_NAME)
+    parser.add_argument("--canvas-size", type=int, default=OCR_CANVAS_SIZE)
+    parser.add_argument("--mag-ratio", type=float, default=OCR_MAG_RATIO)
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE,
+                        help="Pixels from the full-resolution hit that still count as correct")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        args = parse_args()
+        paths = collect_images(args.source)
+        if not paths:
+            print(f"No images found in {args.source}")
+            sys.exit(1)
+
+        print("=" * 60)
+        print(f"OCR Downscale Benchmark - {len(paths)} images, target '{args.target}'")
+        print("=" * 60)
+
+        baseline_ms, summary = run_benchmark(paths, args.scales, args.target, args.canvas_size,
+                                             args.mag_ratio, args.tolerance)
+
+        print("\n" + "=" * 60)
+        print(f"Full-resolution readtext: {baseline_ms:.1f} ms/image")
+        print(f"{'scale':>6} {'mean ms':>9} {'p95 ms':>9} {'speedup':>8} {'accuracy':>9} {'recall':>7} {'cands':>6}")
+        for row in summary:
+            recall = f"{row['recall']:.3f}" if row["recall"] is not None else "-"
+            candidates = f"{row['avg_candidates']:.2f}" if row["avg_candidates"] is not None else "-"
+            print(f"{row['scale']:>6.2f} {row['mean_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['speedup']:>7.2f}x "
+                  f"{row['accuracy']:>9.3f} {recall:>7} {candidates:>6}")
+        print("=" * 60)
+
+    except KeyboardInterrupt:
+        print("\n\nBenchmark stopped by user")
+    except Exception as e:
+        print(f"\n\nFatal error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import time
+
+
+JOURNAL_FILENAME = "run_journal.jsonl"
+
+
+def content_hash(text):
+    """Hash post content independent of the CRLF line endings Notepad may save it with."""
+    normalized = text.replace("\r\n", "\n").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def file_content_hash(path):
+    try:
+        with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+
+class RunJournal:
+    """Append-only JSON Lines log of what happened to each post, one record per step.
+
+    Statuses are "started", "done", "skipped" and "failed". The log is a record
+    for people, not a resume index: a post counts as done when its output file
+    exists and its content matches the expected hash, so a rerun only redoes the
+    posts that are missing or out of date.
+
+    When several processes share one journal, open it once with repair=True
+    before they start and have each of them open it with repair=False, so
+    none truncates records another one has appended since.
+    """
+
+    def __init__(self, path, repair=True):
+        self.path = path
+        if repair:
+            self._repair()
+
+    def _repair(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # A crash mid-write leaves a partial last line; drop it so new records start cleanly
+            good_end = data.rfind(b"\n") + 1
+            if good_end < len(data):
+                f.truncate(good_end)
+
+    def record(self, post_id, digest, status, **extra):
+        entry = {"post_id": post_id, "hash": digest, "status": status,
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        entry.update(extra)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return entry
+
+    def is_done(self, filepath, digest):
+        return file_content_hash(filepath) == digest
@@ -0,0 +1,283 @@
+import argparse
+import functools
+import multiprocessing
+import os
+import queue
+import select
+import shutil
+import subprocess
+import sys
+import time
+
+import requests
+
+from run_journal import RunJournal, JOURNAL_FILENAME
+
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+API_URL = "https://jsonplaceholder.typicode.com/posts"
+TARGET_DIR = os.path.join(os.path.expanduser("~"), "Desktop", "tjm-project")
+DISPLAY_BASE = 90
+SCREEN_GEOMETRY = "1920x1080x24"
+DISPLAY_START_TIMEOUT = 10
+
+
+def fetch_posts(count=10):
+    try:
+        print("Fetching posts from API...")
+        response = requests.get(API_URL, timeout=10)
+        response.raise_for_status()
+        posts = response.json()[:count]
+        print(f"Successfully fetched {len(posts)} posts from API")
+        return posts
+    except Exception as e:
+        print(f"Failed to fetch from API: {e}")
+        print("Using placeholder data instead...")
+        return [{"id": i,
+                 "title": f"Placeholder for post {i}",
+                 "body": f"This is a placeholder for post {i} because API call failed"}
+                for i in range(1, count + 1)]
+
+
+class XvfbSession:
+    """A private X display (Xvfb) running its own copy of the automation bot.
+
+    Each session lives in its own worker process with DISPLAY pointing at its
+    own Xvfb server, so pyautogui input and the pyperclip clipboard (xclip/xsel)
+    never touch another session's desktop.
+
+    Only the display, input and clipboard isolation is provided here. The bot's
+    editor steps are written for Windows Notepad (desktop icon, Ctrl+S save
+    dialog, Alt+F4 then 'n'), and no Linux equivalent is set up, so posts run
+    on an Xvfb desktop will fail unless `setup_command` provides an editor that
+    behaves the same way. Use FakeSession to exercise the scheduler itself.
+    """
+
+    def __init__(self, index, variant="ocr", setup_command=None, geometry=SCREEN_GEOMETRY):
+        self.index = index
+        self.variant = variant
+        self.setup_command = setup_command
+        self.geometry = geometry
+        self.display_number = DISPLAY_BASE + index
+        self.display = f":{self.display_number}"
+        self.server = None
+        self.setup_process = None
+        self.bot = None
+
+    def start(self):
+        if shutil.which("Xvfb") is None:
+            raise RuntimeError("Xvfb is not installed")
+
+        # Xvfb writes the display number to this pipe once it accepts connections. If the display
+        # is already taken it exits instead, so a leftover socket can't pass for our own server.
+        ready_fd, write_fd = os.pipe()
+        try:
+            self.server = subprocess.Popen(
+                ["Xvfb", self.display, "-screen", "0", self.geometry, "-nolisten", "tcp",
+                 "-displayfd", str(write_fd)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, pass_fds=(write_fd,)
+            )
+        finally:
+            os.close(write_fd)
+        with os.fdopen(ready_fd) as ready:
+            readable, _, _ = select.select([ready], [], [], DISPLAY_START_TIMEOUT)
+            announced = ready.readline().strip() if readable else ""
+        if announced != str(self.display_number) or self.server.poll() is not None:
+            raise RuntimeError(f"Xvfb failed to start on display {self.display} (already in use?)")
+
+        # Must be set before pyautogui/pyperclip are imported by the bot module
+        os.environ["DISPLAY"] = self.display
+
+        if self.setup_command:
+            self.setup_process = subprocess.Popen(self.setup_command, shell=True)
+            time.sleep(2)
+
+        if self.variant == "template":
+            from vision_automation_template_matching import VisionAutomation
+        else:
+            from vision_automation import VisionAutomation
+        self.bot = VisionAutomation()
+        print(f"[session {self.index}] Ready on display {self.display}")
+
+    def process_post(self, post, journal):
+        return self.bot.process_post(post, journal)
+
+    def stop(self):
+        for process in (self.setup_process, self.server):
+            if process and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+class FakeSession:
+    """Stand-in for a display session that just waits, for trying the scheduler without a desktop."""
+
+    def __init__(self, index, delay=0.1, fail_ids=(), fail_start=False):
+        self.index = index
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.fail_start = fail_start
+
+    def start(self):
+        if self.fail_start:
+            raise RuntimeError("fake session configured to fail on start")
+
+    def process_post(self, post, journal):
+        time.sleep(self.delay)
+        if post["id"] in self.fail_ids:
+            raise RuntimeError(f"fake failure for post {post['id']}")
+        return "done"
+
+    def stop(self):
+        pass
+
+
+def session_worker(index, session_factory, journal_path, tasks, results):
+    """Pull posts from the shared queue and run them on this worker's session until the queue is empty."""
+    session = session_factory(index)
+    try:
+        session.start()
+    except Exception as e:
+        results.put({"session": index, "error": f"session failed to start: {e}"})
+        results.put({"session": index, "done": True})
+        session.stop()
+        return
+
+    # The parent already repaired the shared journal; only append from here
+    journal = RunJournal(journal_path, repair=False)
+    try:
+        while True:
+            post = tasks.get()
+            if post is None:
+                break
+
+            start = time.perf_counter()
+            record = {"session": index, "post_id": post["id"]}
+            try:
+                record["status"] = session.process_post(post, journal)
+            except Exception as e:
+                record["status"] = "failed"
+                record["error"] = str(e)
+            record["seconds"] = round(time.perf_counter() - start, 2)
+            results.put(record)
+    finally:
+        session.stop()
+        results.put({"session": index, "done": True})
+
+
+def run_sessions(posts, sessions, session_factory, journal_path=None):
+    """Distribute posts over `sessions` worker processes and return (records, summary)."""
+    journal_path = journal_path or os.path.join(TARGET_DIR, JOURNAL_FILENAME)
+    os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+    # Drop a partial record from a crashed run once, before any session can append after it
+    RunJournal(journal_path)
+
+    ctx = multiprocessing.get_context("spawn")
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    for post in posts:
+        tasks.put(post)
+    # One stop marker per worker, queued behind every post
+    for _ in range(sessions):
+        tasks.put(None)
+
+    workers = [ctx.Process(target=session_worker, args=(i, session_factory, journal_path, tasks, results))
+               for i in range(sessions)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    records = []
+    start_errors = []
+    done = 0
+    while done < len(workers):
+        try:
+            record = results.get(timeout=1)
+        except queue.Empty:
+            # A worker that died without reporting would otherwise hang the scheduler
+            if not any(w.is_alive() for w in workers):
+                break
+            continue
+        if record.get("done"):
+            done += 1
+        elif "post_id" in record:
+            records.append(record)
+            print(f"[session {record['session']}] post {record['post_id']}: {record['status']} "
+                  f"({record['seconds']}s)" + (f" - {record['error']}" if record.get("error") else ""))
+        else:
+            start_errors.append(record["error"])
+            print(f"[session {record['session']}] {record['error']}")
+
+    for worker in workers:
+        worker.join()
+    # Leftover posts (no session ever started) must not block interpreter exit
+    tasks.cancel_join_thread()
+    elapsed = time.perf_counter() - start
+
+    # Posts never picked up (e.g. every session failed to start) or lost with a crashed worker
+    handled = {r["post_id"] for r in records}
+    error = "not processed by any session"
+    if start_errors and len(start_errors) == sessions:
+        error += f" (every session failed to start: {start_errors[0]})"
+    for post in posts:
+        if post["id"] not in handled:
+            records.append({"session": None, "post_id": post["id"], "status": "failed", "error": error})
+
+    summary = {"done": 0, "skipped": 0, "failed": 0, "seconds": round(elapsed, 2)}
+    for record in records:
+        summary[record["status"]] += 1
+    summary["posts_per_minute"] = round(summary["done"] / elapsed * 60, 1) if elapsed else 0.0
+    return records, summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the Notepad automation on several isolated displays in parallel. "
+                    "Scheduler only: no backend can complete real posts yet (see --backend)."
+    )
+    parser.add_argument("--backend", choices=["fake", "xvfb"], required=True,
+                        help="fake: sessions that just wait, for trying the scheduler; xvfb: one Xvfb display "
+                             "per session, which isolates display, input and clipboard but fails every post "
+                             "because the bot drives Windows Notepad")
+    parser.add_argument("-n", "--sessions", type=int, default=2, help="Number of parallel display sessions")
+    parser.add_argument("-p", "--posts", type=int, default=10, help="Number of posts to fetch")
+    parser.add_argument("--variant", choices=["ocr", "template"], default="ocr", help="Icon detection to use")
+    parser.add_argument("--setup", default=None,
+                        help="Command started inside each display before the bot, e.g. a desktop/file manager")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        args = parse_args()
+        print("=" * 60)
+        print(f"Parallel Automation - {args.sessions} sessions")
+        print("=" * 60)
+
+        posts = fetch_posts(args.posts)
+        if args.backend == "fake":
+            factory = FakeSession
+        else:
+            factory = functools.partial(XvfbSession, variant=args.variant, setup_command=args.setup)
+
+        records, summary = run_sessions(posts, args.sessions, factory)
+
+        print("\n" + "=" * 60)
+        print(f"Saved: {summary['done']} | Skipped: {summary['skipped']} | Failed: {summary['failed']}")
+        print(f"Total time: {summary['seconds']}s ({summary['posts_per_minute']} posts/minute)")
+        print("=" * 60)
+
+    except KeyboardInterrupt:
+        print("\n\nAutomation stopped by user")
+    except Exception as e:
+        print(f"\n\nFatal error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,70 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+import batch_detection
+
+
+@pytest.fixture
+def screenshots(tmp_path):
+    frame = np.random.default_rng(0).integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    cv2.imwrite(str(tmp_path / "shot.png"), frame)
+    cv2.imwrite(str(tmp_path / "icon.png"), frame[40:80, 60:100])
+    return tmp_path
+
+
+def test_missing_template_fails_before_starting_workers(screenshots):
+    output = screenshots / "out.jsonl"
+    with pytest.raises(FileNotFoundError):
+        batch_detection.run_batch(str(screenshots / "shot.png"), str(output), "template",
+                                  template_path=str(screenshots / "missing.png"), workers=1)
+    assert not output.exists() or output.read_text() == ""
+
+
+def test_worker_with_broken_engine_writes_error_record(screenshots):
+    batch_detection._init_worker("template", {"template_path": str(screenshots / "missing.png")})
+    record = batch_detection._detect_image(str(screenshots / "shot.png"))
+    assert record["found"] is False
+    assert "engine failed to start" in record["error"]
+
+
+def test_batch_run_writes_records_and_resumes(screenshots):
+    output = screenshots / "out.jsonl"
+    summary = batch_detection.run_batch(str(screenshots / "shot.png"), str(output), "template",
+                                        template_path=str(screenshots / "icon.png"), workers=1)
+    assert summary["processed"] == 1
+    record = json.loads(output.read_text().splitlines()[0])
+    assert record["found"] is True
+    assert (record["x"], record["y"]) == (80, 60)
+
+    summary = batch_detection.run_batch(str(screenshots / "shot.png"), str(output), "template",
+                                        template_path=str(screenshots / "icon.png"), workers=1)
+    assert summary["processed"] == 0
+
+
+def test_rerun_with_other_settings_processes_images_again(screenshots):
+    output = screenshots / "out.jsonl"
+    args = (str(screenshots / "shot.png"), str(output), "template")
+    batch_detection.run_batch(*args, template_path=str(screenshots / "icon.png"), workers=1)
+
+    summary = batch_detection.run_batch(*args, template_path=str(screenshots / "icon.png"),
+                                        threshold=0.99, workers=1)
+    assert summary["processed"] == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["settings"]["threshold"] for r in records] == [0.7, 0.99]
+
+    settings = batch_detection.engine_settings("template", {"template_path": str(screenshots / "icon.png")})
+    assert batch_detection.load_completed(str(output), "template", settings) == {records[0]["image"]}
+    assert batch_detection.load_completed(str(output), "ocr", settings) == set()
+
+
+def test_ocr_check_does_not_build_the_engine(monkeypatch):
+    monkeypatch.setattr(batch_detection, "missing_ocr_models", lambda: [])
+    monkeypatch.setattr(batch_detection, "create_engine", lambda *args, **kwargs: pytest.fail("engine built"))
+    batch_detection.check_engine("ocr", {})
+
+    monkeypatch.setattr(batch_detection.importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError):
+        batch_detection.check_engine("ocr", {})
@@ -0,0 +1,138 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import detectors
+from detectors import find_text_downscaled, match_template_multiscale
+
+
+class FakeReader:
+    """Records the calls EasyOCR would get and answers with fixed boxes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def readtext(self, image, **kwargs):
+        self.calls.append(("readtext", image.shape, kwargs))
+        return [([[10, 10], [50, 10], [50, 30], [10, 30]], "Notepad", 0.9)]
+
+    def detect(self, image, **kwargs):
+        self.calls.append(("detect", image.shape, kwargs))
+        return [[[25, 40, 10, 15], [60, 90, 60, 70]]], [[]]
+
+    def recognize(self, grey, horizontal_list, free_list):
+        self.calls.append(("recognize", grey.shape, horizontal_list))
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            box = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            if grey.shape[0] < 200:
+                # At reduced resolution the label is misread, the other box is unrelated text
+                results.append((box, "Notepd" if x_min < 50 else "Recycle Bin", 0.4))
+            else:
+                results.append((box, "Notepad", 0.95))
+        return results
+
+
+def test_full_scale_passes_canvas_size_and_mag_ratio():
+    reader = FakeReader()
+    hit = find_text_downscaled(reader, np.zeros((400, 400, 3), np.uint8), "Notepad",
+                               scale=1.0, canvas_size=1280, mag_ratio=1.5)
+
+    assert hit[:3] == (30, 20, "Notepad")
+    assert reader.calls == [("readtext", (400, 400, 3), {"canvas_size": 1280, "mag_ratio": 1.5})]
+
+
+def test_full_scale_shares_find_text(monkeypatch):
+    calls = []
+    monkeypatch.setattr(detectors, "find_text", lambda *args: calls.append(args) or "hit")
+    image = np.zeros((40, 40, 3), np.uint8)
+
+    assert find_text_downscaled("reader", image, "Notepad", scale=1.0, canvas_size=1280, mag_ratio=1.5) == "hit"
+    assert calls == [("reader", image, "Notepad", 1280, 1.5)]
+
+
+def test_downscaled_detection_rereads_only_candidates_at_full_resolution():
+    reader = FakeReader()
+    stats = {}
+    hit = find_text_downscaled(reader, np.zeros((400, 400, 3), np.uint8), "Notepad", scale=0.25, stats=stats)
+
+    assert reader.calls[0][:2] == ("detect", (100, 100, 3))
+    assert stats == {"boxes": 2, "candidates": 1}
+    full_calls = [call for call in reader.calls if call[0] == "recognize" and call[1] == (400, 400)]
+    assert full_calls == [("recognize", (400, 400), [[98, 162, 38, 62]])]
+    assert hit[:3] == (130, 50, "Notepad")
+
+
+def _scene():
+    rng = np.random.default_rng(0)
+    template = rng.integers(0, 256, (40, 40, 3), dtype=np.uint8)
+    screenshot = rng.integers(0, 256, (300, 300, 3), dtype=np.uint8)
+    screenshot[100:148, 50:98] = cv2.resize(template, (48, 48))
+    return screenshot, template
+
+
+def test_parallel_scale_search_matches_sequential():
+    screenshot, template = _scene()
+    scales = [1.0, 0.8, 1.2, 0.6, 1.4, 0.1]
+    sequential = {}
+    parallel = {}
+
+    expected = match_template_multiscale(screenshot, template, scales, stats=sequential)
+    result = match_template_multiscale(screenshot, template, scales, workers=3, stats=parallel)
+
+    assert result == expected
+    assert result[1:] == ((50, 100), (48, 48))
+    assert parallel == sequential == {"evaluated": 5, "skipped": 1, "cancelled": 0, "total": 6, "scale": 1.2}
+
+
+def test_certain_match_on_likeliest_scale_skips_the_rest():
+    screenshot, template = _scene()
+    stats = {}
+
+    confidence, location, _ = match_template_multiscale(screenshot, template, [1.2, 1.0, 0.8, 0.6, 1.4],
+                                                        certain=0.95, workers=4, stats=stats)
+
+    assert confidence >= 0.95 and location == (50, 100)
+    assert stats == {"evaluated": 1, "skipped": 0, "cancelled": 4, "total": 5, "scale": 1.2}
+
+
+def test_certain_match_stops_starting_new_scales(monkeypatch):
+    running = []
+    peak = []
+
+    def fake_match(screenshot_np, template, scale):
+        running.append(scale)
+        peak.append(len(running))
+        time.sleep(0.05 if scale == 1.2 else 0.2)
+        running.remove(scale)
+        return (0.99 if scale == 1.2 else 0.5), (0, 0), (10, 10)
+
+    monkeypatch.setattr(detectors, "_match_at_scale", fake_match)
+    stats = {}
+    detectors.match_template_multiscale(None, None, [1.0, 1.2, 0.8, 0.6, 1.4, 0.9],
+                                        certain=0.95, workers=2, stats=stats)
+
+    # 1.0 alone, then 1.2 and 0.8 together; 1.2 is certain so nothing after them starts
+    assert max(peak) == 2
+    assert stats == {"evaluated": 3, "skipped": 0, "cancelled": 3, "total": 6, "scale": 1.2}
+
+
+def test_concurrent_first_calls_share_one_scale_pool(monkeypatch):
+    monkeypatch.setattr(detectors, "_scale_pools", {})
+    start = threading.Barrier(8)
+    pools = []
+
+    def first_call():
+        start.wait()
+        pools.append(detectors._get_scale_pool(3))
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(pool) for pool in pools}) == 1
+    pools[0].shutdown()
@@ -0,0 +1,84 @@
+import os
+import signal
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from frame_bus import FrameBus, ReplaySource, run_frame_bus
+
+
+@pytest.fixture
+def replay_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (120, 160, 3), dtype=np.uint8) for _ in range(3)]
+    for i, frame in enumerate(frames):
+        cv2.imwrite(str(tmp_path / f"frame_{i}.png"), frame)
+    # Same content as frame_0 but from a "different monitor"
+    cv2.imwrite(str(tmp_path / "frame_3.png"), cv2.resize(frames[0], (320, 240)))
+    cv2.imwrite(str(tmp_path / "icon.png"), frames[1][40:80, 60:100])
+    return tmp_path, frames
+
+
+def test_bus_round_trip_is_zero_copy():
+    bus = FrameBus.create((4, 5, 3), slots=2, consumers=1)
+    try:
+        frame = np.full((4, 5, 3), 7, dtype=np.uint8)
+        seq = bus.publish(frame)
+        read_seq, view = bus.read(0)
+        assert read_seq == seq == 1
+        assert np.array_equal(view, frame)
+        assert view.base is not None and not view.flags.owndata
+        assert bus.is_current(seq)
+        del view
+    finally:
+        bus.close()
+
+
+def test_replay_source_skips_or_resizes_mismatched_frames(replay_dir, capsys):
+    path, _ = replay_dir
+    source = str(path / "frame_*.png")
+
+    assert len(list(ReplaySource(source))) == 3
+    assert "does not match" in capsys.readouterr().out
+
+    resized = list(ReplaySource(source, resize=True))
+    assert len(resized) == 4
+    assert all(frame.shape == (120, 160, 3) for frame in resized)
+
+
+def test_replay_runs_every_detector_on_every_frame(replay_dir):
+    path, _ = replay_dir
+    template = str(path / "icon.png")
+    detectors = [{"engine": "template", "template_path": template},
+                 {"engine": "template", "template_path": template, "threshold": 0.99}]
+
+    records = run_frame_bus(ReplaySource(str(path / "frame_*.png")), detectors, slots=2)
+
+    assert sorted((r["seq"], r["consumer"]) for r in records) == [(s, c) for s in (1, 2, 3) for c in (0, 1)]
+    hits = [r for r in records if r["found"]]
+    assert {r["seq"] for r in hits} == {2}
+    assert all((r["x"], r["y"]) == (80, 60) for r in hits)
+
+
+def test_killed_detector_does_not_stall_the_producer(replay_dir):
+    path, _ = replay_dir
+    template = str(path / "icon.png")
+    detectors = [{"engine": "template", "template_path": template}] * 2
+
+    def kill_second(record):
+        if record.get("consumer") == 1 and record.get("seq") == 1:
+            os.kill(record["pid"], getattr(signal, "SIGKILL", signal.SIGTERM))
+
+    outcome = {}
+    runner = threading.Thread(target=lambda: outcome.update(records=run_frame_bus(
+        ReplaySource(str(path / "frame_*.png")), detectors, slots=1, on_result=kill_second)), daemon=True)
+    runner.start()
+    runner.join(timeout=60)
+
+    assert not runner.is_alive(), "run_frame_bus hung after a detector was killed"
+    records = outcome["records"]
+    assert sorted(r["seq"] for r in records if r.get("consumer") == 0 and "seq" in r) == [1, 2, 3]
+    assert [r for r in records if r.get("consumer") == 1 and "error" in r][0]["error"].startswith(
+        "detector process exited")
@@ -0,0 +1,25 @@
+import json
+
+from run_journal import RunJournal, content_hash, file_content_hash
+
+
+def test_content_hash_ignores_crlf_and_bom(tmp_path):
+    text = "Title: Post 1\n\nFirst line\nSecond line"
+    saved = tmp_path / "post_1.txt"
+    saved.write_bytes(b"\xef\xbb\xbf" + text.replace("\n", "\r\n").encode("utf-8") + b"\r\n")
+
+    assert content_hash(text.replace("\n", "\r\n")) == content_hash(text)
+    assert file_content_hash(str(saved)) == content_hash(text)
+    assert file_content_hash(str(tmp_path / "missing.txt")) is None
+
+
+def test_partial_last_line_is_dropped_before_appending(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_bytes(b'{"post_id": 1, "status": "done"}\n{"post_id": 2, "sta')
+
+    journal = RunJournal(str(path))
+    journal.record(2, "abc", "started", file="post_2.txt")
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["post_id"], r["status"]) for r in records] == [(1, "done"), (2, "started")]
+    assert records[1]["file"] == "post_2.txt"
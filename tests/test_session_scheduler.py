@@ -0,0 +1,98 @@
+import functools
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from run_journal import RunJournal
+from session_scheduler import FakeSession, XvfbSession, parse_args, run_sessions
+
+
+class FirstSessionBroken(FakeSession):
+    def start(self):
+        if self.index == 0:
+            raise RuntimeError("display 0 is broken")
+
+
+class JournalingSession(FakeSession):
+    def process_post(self, post, journal):
+        time.sleep(self.delay)
+        journal.record(post["id"], None, "done")
+        return "done"
+
+
+def make_posts(count):
+    return [{"id": i, "title": f"Title {i}", "body": f"Body {i}"} for i in range(1, count + 1)]
+
+
+def test_posts_are_spread_over_sessions(tmp_path):
+    posts = make_posts(12)
+    records, summary = run_sessions(posts, 3, functools.partial(FakeSession, delay=0.05),
+                                    str(tmp_path / "journal.jsonl"))
+
+    assert sorted(r["post_id"] for r in records) == list(range(1, 13))
+    assert summary["done"] == 12 and summary["failed"] == 0
+    assert len({r["session"] for r in records}) > 1
+    assert summary["posts_per_minute"] > 0
+
+
+def test_post_failure_stays_in_its_session(tmp_path):
+    records, summary = run_sessions(make_posts(6), 2, functools.partial(FakeSession, delay=0.01, fail_ids={3}),
+                                    str(tmp_path / "journal.jsonl"))
+
+    failed = [r for r in records if r["status"] == "failed"]
+    assert [r["post_id"] for r in failed] == [3]
+    assert "fake failure" in failed[0]["error"]
+    assert summary["done"] == 5
+
+
+def test_broken_session_leaves_work_to_the_others(tmp_path):
+    records, summary = run_sessions(make_posts(5), 2, functools.partial(FirstSessionBroken, delay=0.01),
+                                    str(tmp_path / "journal.jsonl"))
+
+    assert summary["done"] == 5
+    assert {r["session"] for r in records} == {1}
+
+
+def test_shared_journal_is_repaired_once_before_sessions_start(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_bytes(b'{"post_id": 1, "status": "done"}\n{"post_id": 2, "sta')
+    # Workers open it without repairing, so they can't cut off what another session is writing
+    RunJournal(str(journal), repair=False)
+    assert journal.read_bytes().endswith(b'"sta')
+
+    run_sessions(make_posts(4), 2, functools.partial(JournalingSession, delay=0.01), str(journal))
+
+    lines = journal.read_text().splitlines()
+    assert lines[0] == '{"post_id": 1, "status": "done"}'
+    assert sorted(json.loads(line)["post_id"] for line in lines[1:]) == [1, 2, 3, 4]
+
+
+def test_all_sessions_failing_to_start_is_reported(tmp_path):
+    records, summary = run_sessions(make_posts(3), 2, functools.partial(FakeSession, fail_start=True),
+                                    str(tmp_path / "journal.jsonl"))
+
+    assert summary["failed"] == 3
+    assert all("every session failed to start" in r["error"] for r in records)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Xvfb sessions need a POSIX system")
+def test_xvfb_session_fails_when_the_display_is_taken(tmp_path, monkeypatch):
+    # Stand-in for an Xvfb that finds the display already active and exits without announcing it
+    fake_xvfb = tmp_path / "Xvfb"
+    fake_xvfb.write_text("#!/bin/sh\necho 'Server is already active for display 90' >&2\nexit 1\n")
+    fake_xvfb.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    session = XvfbSession(0)
+    with pytest.raises(RuntimeError, match="failed to start on display :90"):
+        session.start()
+    session.stop()
+
+
+def test_backend_must_be_chosen_explicitly():
+    with pytest.raises(SystemExit):
+        parse_args(["-n", "2"])
+    assert parse_args(["--backend", "fake"]).backend == "fake"
@@ -0,0 +1,121 @@
+import importlib
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from run_journal import RunJournal, content_hash
+
+
+class FakeDesktop:
+    """Stands in for pyautogui and pyperclip: Notepad saves the pasted text to the pasted path on Enter."""
+
+    FAILSAFE = True
+    PAUSE = 0
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.clipboard = ""
+        self.pasted = []
+        self.saves = 0
+
+    def screenshot(self):
+        return Image.fromarray(self.screen)
+
+    def copy(self, text):
+        self.clipboard = text
+
+    def hotkey(self, *keys):
+        if keys == ("ctrl", "v"):
+            self.pasted.append(self.clipboard)
+
+    def press(self, key):
+        if key == "enter" and len(self.pasted) >= 2:
+            content, path = self.pasted[0], self.pasted[-1]
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.pasted = []
+            self.saves += 1
+
+    def easeInOutQuad(self, n):
+        return n
+
+    def moveTo(self, *args, **kwargs):
+        pass
+
+    def doubleClick(self, *args, **kwargs):
+        pass
+
+    def write(self, *args, **kwargs):
+        pass
+
+
+class FakeReader:
+    def readtext(self, image, **kwargs):
+        return [([[10, 10], [50, 10], [50, 30], [10, 30]], "Notepad", 0.9)]
+
+
+@pytest.fixture(params=["vision_automation", "vision_automation_template_matching"])
+def bot(request, tmp_path, monkeypatch):
+    # The bots import pyautogui and pyperclip at module level and create their output folder under HOME
+    for name in ("pyautogui", "pyperclip"):
+        if name not in sys.modules:
+            monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    module = importlib.import_module(request.param)
+
+    screen = np.random.default_rng(0).integers(0, 255, (200, 300, 3), dtype=np.uint8)
+    desktop = FakeDesktop(screen)
+    monkeypatch.setattr(module, "pyautogui", desktop)
+    monkeypatch.setattr(module, "pyperclip", desktop)
+    monkeypatch.setattr(module.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(module, "TARGET_DIR", str(tmp_path / "out"))
+    os.makedirs(module.TARGET_DIR)
+
+    if request.param == "vision_automation":
+        # Skip __init__, which loads the real EasyOCR models
+        instance = module.VisionAutomation.__new__(module.VisionAutomation)
+        instance.reader = FakeReader()
+        instance.mouse_duration = 0
+        instance.mouse_tween = None
+    else:
+        template = tmp_path / "icon.png"
+        Image.fromarray(screen[50:90, 100:140]).save(template)
+        instance = module.VisionAutomation(template_path=str(template))
+    return module, instance, desktop
+
+
+def post_file(module, post):
+    return os.path.join(module.TARGET_DIR, f"post_{post['id']}.txt")
+
+
+POST = {"id": 7, "title": "Hello", "body": "First line\nSecond line"}
+CONTENT = f"Title: {POST['title']}\n\n{POST['body']}"
+
+
+def test_post_with_matching_file_is_skipped(bot):
+    module, instance, desktop = bot
+    with open(post_file(module, POST), "w", encoding="utf-8", newline="\r\n") as f:
+        f.write(CONTENT)
+    journal = RunJournal(os.path.join(module.TARGET_DIR, "journal.jsonl"))
+
+    assert instance.process_post(POST, journal) == "skipped"
+    assert desktop.saves == 0
+
+
+@pytest.mark.parametrize("existing", [None, "Title: Hello\n\nOld body"])
+def test_missing_or_stale_post_is_written_again(bot, existing):
+    module, instance, desktop = bot
+    if existing is not None:
+        with open(post_file(module, POST), "w", encoding="utf-8") as f:
+            f.write(existing)
+    journal = RunJournal(os.path.join(module.TARGET_DIR, "journal.jsonl"))
+
+    assert instance.process_post(POST, journal) == "done"
+    assert desktop.saves == 1
+    with open(post_file(module, POST), encoding="utf-8") as f:
+        assert content_hash(f.read()) == content_hash(CONTENT)
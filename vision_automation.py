@@ -6,12 +6,17 @@ import time
 from PIL import Image
 import os
 import sys
-import pygetwindow as gw
 import pyperclip
 
+from detectors import find_text_downscaled, OCR_CANVAS_SIZE, OCR_MAG_RATIO, OCR_SCALE
+from run_journal import RunJournal, content_hash, JOURNAL_FILENAME
+
 if sys.platform == "win32":
     import codecs
+    import pygetwindow as gw
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+else:
+    gw = None  # PyGetWindow only supports Windows; window activation is skipped elsewhere
 
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
@@ -67,16 +72,13 @@ class VisionAutomation:
             screenshot_np = np.array(screenshot)
             screenshot_np = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
             
-            results = self.reader.readtext(screenshot_np)
+            hit = find_text_downscaled(self.reader, screenshot_np, TARGET_ICON_NAME,
+                                       scale=OCR_SCALE, canvas_size=OCR_CANVAS_SIZE, mag_ratio=OCR_MAG_RATIO)
             
-            for (bbox, text, prob) in results:
-                if TARGET_ICON_NAME.lower() in text.lower():
-                    top_left = bbox[0]
-                    bottom_right = bbox[2]
-                    center_x = int((top_left[0] + bottom_right[0]) / 2)
-                    center_y = int((top_left[1] + bottom_right[1]) / 2)
-                    print(f"Found '{text}' at ({center_x}, {center_y})")
-                    return center_x, center_y
+            if hit:
+                center_x, center_y, text, _, _ = hit
+                print(f"Found '{text}' at ({center_x}, {center_y})")
+                return center_x, center_y
             
             print(f"'{TARGET_ICON_NAME}' not found in screenshot")
             return None
@@ -132,113 +134,142 @@ class VisionAutomation:
             if (i + 1) % 50 == 0:
                 print(f"  Typed {i + 1}/{len(text)} characters...")
 
-    def process_automation(self):
-        posts, is_fallback = self.fetch_posts()
+    def process_post(self, post, journal):
+        """Open Notepad, write and save one post; returns "done", "skipped" or "failed"."""
+        content = f"Title: {post['title']}\n\n{post['body']}"
+        digest = content_hash(content)
+        filename = f"post_{post['id']}.txt"
+        filepath = os.path.join(TARGET_DIR, filename)
         
-        if not posts:
-            print("No posts to process!")
-            return
+        # Skip posts already saved with the same content by an earlier run
+        if journal.is_done(filepath, digest):
+            print(f"Post {post['id']} already saved with matching content, skipping")
+            journal.record(post['id'], digest, "skipped", file=filepath)
+            return "skipped"
         
-        if is_fallback:
-            print("\n⚠️  Using placeholder data due to API failure ⚠️\n")
+        journal.record(post['id'], digest, "started", file=filepath)
         
-        for i, post in enumerate(posts, 1):
-            print(f"\n{'='*50}")
-            print(f"Processing Post {i}/{len(posts)} - ID: {post['id']}")
-            print(f"{'='*50}")
+        coords = None
+        for attempt in range(3):
+            print(f"Attempt {attempt + 1}/3 to find Notepad icon...")
+            coords = self.get_icon_coordinates()
+            if coords:
+                break
+            time.sleep(2)
+        
+        if not coords:
+            print(f"ERROR: Could not find Notepad icon after 3 attempts!")
+            print("Make sure Notepad shortcut is visible on desktop")
+            journal.record(post['id'], digest, "failed", file=filepath, error="icon not found")
+            return "failed"
+
+        try:
+            self.move_mouse_smoothly(coords[0], coords[1])
             
-            coords = None
-            for attempt in range(3):
-                print(f"Attempt {attempt + 1}/3 to find Notepad icon...")
-                coords = self.get_icon_coordinates()
-                if coords:
-                    break
-                time.sleep(2)
+            print(f"Double-clicking at position {coords}")
+            pyautogui.doubleClick()
+            time.sleep(1)  
             
-            if not coords:
-                print(f"ERROR: Could not find Notepad icon after 3 attempts!")
-                print("Make sure Notepad shortcut is visible on desktop")
-                continue
-
-            try:
-                self.move_mouse_smoothly(coords[0], coords[1])
-                
-                print(f"Double-clicking at position {coords}")
-                pyautogui.doubleClick()
-                time.sleep(1)  
-                
+            notepad_window = None
+            if gw is not None:
                 print("Looking for Notepad window...")
-                notepad_window = None
                 for _ in range(5):  
                     windows = gw.getWindowsWithTitle('Notepad')
                     if windows:
                         notepad_window = windows[0]
                         break
                     time.sleep(0.2)
-                
-                if notepad_window:
-                    print("Activating Notepad window...")
-                    notepad_window.activate()
-                    time.sleep(1)
-                else:
-                    print("Warning: Could not find Notepad window, proceeding anyway...")
-                    time.sleep(1)
-
-                print("Writing content...")
-                content = f"Title: {post['title']}\n\n{post['body']}"
-                self.write_text_fast(content)
-                time.sleep(0.2)
-                
-                print("Saving file (Ctrl+S)...")
-                pyautogui.hotkey('ctrl', 's')
-                time.sleep(2.5)  
-                
-                filename = f"post_{post['id']}.txt"
-                filepath = os.path.join(TARGET_DIR, filename)
-                
-                if os.path.exists(filepath):
-                    print(f"File exists, removing: {filepath}")
-                    try:
-                        os.remove(filepath)
-                    except:
-                        pass
-                
-                print(f"Entering filepath: {filepath}")
-                pyautogui.hotkey('ctrl', 'a')  
-                time.sleep(0.2)
-                
-                pyperclip.copy(filepath)
-                pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.8)
-                
-                print("Pressing Enter to save...")
-                pyautogui.press('enter')
-                time.sleep(2)
-                
-                pyautogui.press('enter')  
+            
+            if notepad_window:
+                print("Activating Notepad window...")
+                notepad_window.activate()
                 time.sleep(1)
-                
-                print("Closing Notepad (Alt+F4)...")
-                pyautogui.hotkey('alt', 'f4')
-                time.sleep(1.5)
-                
-                pyautogui.press('n')  
-                time.sleep(0.8)
-                
-                print(f"Successfully processed post {post['id']}")
-                
-            except Exception as e:
-                print(f"Error processing post {post['id']}: {e}")
+            else:
+                print("Warning: Could not find Notepad window, proceeding anyway...")
+                time.sleep(1)
+
+            print("Writing content...")
+            self.write_text_fast(content)
+            time.sleep(0.2)
+            
+            print("Saving file (Ctrl+S)...")
+            pyautogui.hotkey('ctrl', 's')
+            time.sleep(2.5)  
+            
+            if os.path.exists(filepath):
+                print(f"File exists, removing: {filepath}")
                 try:
-                    pyautogui.hotkey('alt', 'f4')
-                    time.sleep(0.5)
-                    pyautogui.press('n')
+                    os.remove(filepath)
                 except:
                     pass
-                continue
+            
+            print(f"Entering filepath: {filepath}")
+            pyautogui.hotkey('ctrl', 'a')  
+            time.sleep(0.2)
+            
+            pyperclip.copy(filepath)
+            pyautogui.hotkey('ctrl', 'v')
+            time.sleep(0.8)
+            
+            print("Pressing Enter to save...")
+            pyautogui.press('enter')
+            time.sleep(2)
+            
+            pyautogui.press('enter')  
+            time.sleep(1)
+            
+            print("Closing Notepad (Alt+F4)...")
+            pyautogui.hotkey('alt', 'f4')
+            time.sleep(1.5)
+            
+            pyautogui.press('n')  
+            time.sleep(0.8)
+            
+            if journal.is_done(filepath, digest):
+                journal.record(post['id'], digest, "done", file=filepath)
+                print(f"Successfully processed post {post['id']}")
+                return "done"
+            else:
+                journal.record(post['id'], digest, "failed", file=filepath,
+                               error="saved file missing or content mismatch")
+                print(f"Warning: {filepath} is missing or does not match post {post['id']}")
+                return "failed"
+            
+        except Exception as e:
+            print(f"Error processing post {post['id']}: {e}")
+            journal.record(post['id'], digest, "failed", file=filepath, error=str(e))
+            try:
+                pyautogui.hotkey('alt', 'f4')
+                time.sleep(0.5)
+                pyautogui.press('n')
+            except:
+                pass
+            return "failed"
+
+    def process_automation(self):
+        posts, is_fallback = self.fetch_posts()
+        
+        if not posts:
+            print("No posts to process!")
+            return
+        
+        if is_fallback:
+            print("\n⚠️  Using placeholder data due to API failure ⚠️\n")
+        
+        journal = RunJournal(os.path.join(TARGET_DIR, JOURNAL_FILENAME))
+        outcomes = {"done": 0, "skipped": 0, "failed": 0}
+        
+        for i, post in enumerate(posts, 1):
+            print(f"\n{'='*50}")
+            print(f"Processing Post {i}/{len(posts)} - ID: {post['id']}")
+            print(f"{'='*50}")
+            
+            status = self.process_post(post, journal)
+            outcomes[status] += 1
         
         print(f"\n{'='*50}")
         print("Automation completed!")
+        print(f"Saved: {outcomes['done']} | Skipped (already done): {outcomes['skipped']} | Failed: {outcomes['failed']}")
         print(f"Files saved to: {TARGET_DIR}")
         if is_fallback:
             print("⚠️  NOTE: Placeholder data was used due to API failure")
@@ -6,12 +6,18 @@ import time
 from PIL import Image
 import os
 import sys
-import pygetwindow as gw
 import pyperclip
 
+from detectors import (match_template_multiscale, order_scales, TEMPLATE_CERTAIN_THRESHOLD,
+                       TEMPLATE_MATCH_THRESHOLD, TEMPLATE_SCALE_WORKERS, TEMPLATE_SCALES)
+from run_journal import RunJournal, content_hash, JOURNAL_FILENAME
+
 if sys.platform == "win32":
     import codecs
+    import pygetwindow as gw
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+else:
+    gw = None  # PyGetWindow only supports Windows; window activation is skipped elsewhere
 
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
@@ -20,7 +26,6 @@ API_URL = "https://jsonplaceholder.typicode.com/posts"
 TARGET_DIR = os.path.join(os.path.expanduser("~"), "Desktop", "tjm-project")
 TARGET_ICON_NAME = "Notepad"
 TEMPLATE_IMAGE_PATH = os.path.join(os.path.dirname(__file__), "templates", "notepad_icon.png")
-TEMPLATE_MATCH_THRESHOLD = 0.7  # Confidence threshold for template matching
 
 
 if not os.path.exists(TARGET_DIR):
@@ -31,6 +36,10 @@ class VisionAutomation:
     def __init__(self, template_path=None):
         self.template_path = template_path or TEMPLATE_IMAGE_PATH
         self.threshold = TEMPLATE_MATCH_THRESHOLD
+        self.certain_threshold = TEMPLATE_CERTAIN_THRESHOLD
+        self.scale_workers = TEMPLATE_SCALE_WORKERS
+        self.scale_wins = {}  # How often each scale gave the match, to try likely scales first
+        self.last_scales_evaluated = 0
         
         # Check if template image exists
         if not os.path.exists(self.template_path):
@@ -70,37 +79,20 @@ class VisionAutomation:
             screenshot_np = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
             
             # Try multiscale template matching for better detection
-            best_match = None
-            best_confidence = 0
-            best_location = None
-            scales = [1.0, 0.8, 1.2, 0.6, 1.4]  # Try different scales
-            
-            for scale in scales:
-                # Resize template
-                width = int(template.shape[1] * scale)
-                height = int(template.shape[0] * scale)
-                
-                if width < 10 or height < 10 or width > screenshot_np.shape[1] or height > screenshot_np.shape[0]:
-                    continue
-                
-                resized_template = cv2.resize(template, (width, height))
-                
-                # Perform template matching
-                result = cv2.matchTemplate(screenshot_np, resized_template, cv2.TM_CCOEFF_NORMED)
-                
-                # Find the best match
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                
-                if max_val > best_confidence:
-                    best_confidence = max_val
-                    best_location = max_loc
-                    best_match = resized_template
+            stats = {}
+            best_confidence, best_location, best_size = match_template_multiscale(
+                screenshot_np, template, order_scales(TEMPLATE_SCALES, self.scale_wins),
+                certain=self.certain_threshold, workers=self.scale_workers, stats=stats
+            )
+            self.last_scales_evaluated = stats["evaluated"]
+            print(f"Evaluated {stats['evaluated']}/{stats['total']} scales")
             
             if best_confidence >= self.threshold and best_location:
                 # Calculate center of matched region
-                template_h, template_w = best_match.shape[:2]
+                template_w, template_h = best_size
                 center_x = best_location[0] + template_w // 2
                 center_y = best_location[1] + template_h // 2
+                self.scale_wins[stats["scale"]] = self.scale_wins.get(stats["scale"], 0) + 1
                 
                 print(f"Found icon at ({center_x}, {center_y}) with confidence {best_confidence:.2f}")
                 return center_x, center_y
@@ -161,113 +153,142 @@ class VisionAutomation:
             if (i + 1) % 50 == 0:
                 print(f"  Typed {i + 1}/{len(text)} characters...")
 
-    def process_automation(self):
-        posts, is_fallback = self.fetch_posts()
+    def process_post(self, post, journal):
+        """Open Notepad, write and save one post; returns "done", "skipped" or "failed"."""
+        content = f"Title: {post['title']}\n\n{post['body']}"
+        digest = content_hash(content)
+        filename = f"post_{post['id']}.txt"
+        filepath = os.path.join(TARGET_DIR, filename)
         
-        if not posts:
-            print("No posts to process!")
-            return
+        # Skip posts already saved with the same content by an earlier run
+        if journal.is_done(filepath, digest):
+            print(f"Post {post['id']} already saved with matching content, skipping")
+            journal.record(post['id'], digest, "skipped", file=filepath)
+            return "skipped"
         
-        if is_fallback:
-            print("\n⚠️  Using placeholder data due to API failure ⚠️\n")
+        journal.record(post['id'], digest, "started", file=filepath)
         
-        for i, post in enumerate(posts, 1):
-            print(f"\n{'='*50}")
-            print(f"Processing Post {i}/{len(posts)} - ID: {post['id']}")
-            print(f"{'='*50}")
+        coords = None
+        for attempt in range(3):
+            print(f"Attempt {attempt + 1}/3 to find Notepad icon...")
+            coords = self.get_icon_coordinates()
+            if coords:
+                break
+            time.sleep(1)
+        
+        if not coords:
+            print(f"ERROR: Could not find Notepad icon after 3 attempts!")
+            print("Make sure Notepad shortcut is visible on desktop")
+            journal.record(post['id'], digest, "failed", file=filepath, error="icon not found")
+            return "failed"
+
+        try:
+            self.move_mouse_smoothly(coords[0], coords[1])
             
-            coords = None
-            for attempt in range(3):
-                print(f"Attempt {attempt + 1}/3 to find Notepad icon...")
-                coords = self.get_icon_coordinates()
-                if coords:
-                    break
-                time.sleep(1)
+            print(f"Double-clicking at position {coords}")
+            pyautogui.doubleClick()
+            time.sleep(1)  
             
-            if not coords:
-                print(f"ERROR: Could not find Notepad icon after 3 attempts!")
-                print("Make sure Notepad shortcut is visible on desktop")
-                continue
-
-            try:
-                self.move_mouse_smoothly(coords[0], coords[1])
-                
-                print(f"Double-clicking at position {coords}")
-                pyautogui.doubleClick()
-                time.sleep(1)  
-                
+            notepad_window = None
+            if gw is not None:
                 print("Looking for Notepad window...")
-                notepad_window = None
                 for _ in range(5):  
                     windows = gw.getWindowsWithTitle('Notepad')
                     if windows:
                         notepad_window = windows[0]
                         break
                     time.sleep(0.1)
-                
-                if notepad_window:
-                    print("Activating Notepad window...")
-                    notepad_window.activate()
-                    time.sleep(1)
-                else:
-                    print("Warning: Could not find Notepad window, proceeding anyway...")
-                    time.sleep(1)
-
-                print("Writing content...")
-                content = f"Title: {post['title']}\n\n{post['body']}"
-                self.write_text_fast(content)
-                time.sleep(0.1)
-                
-                print("Saving file (Ctrl+S)...")
-                pyautogui.hotkey('ctrl', 's')
-                time.sleep(1)  
-                
-                filename = f"post_{post['id']}.txt"
-                filepath = os.path.join(TARGET_DIR, filename)
-                
-                if os.path.exists(filepath):
-                    print(f"File exists, removing: {filepath}")
-                    try:
-                        os.remove(filepath)
-                    except:
-                        pass
-                
-                print(f"Entering filepath: {filepath}")
-                pyautogui.hotkey('ctrl', 'a')  
-                time.sleep(0.1)
-                
-                pyperclip.copy(filepath)
-                pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.1)
-                
-                print("Pressing Enter to save...")
-                pyautogui.press('enter')
-                time.sleep(1)
-                
-                pyautogui.press('enter')  
+            
+            if notepad_window:
+                print("Activating Notepad window...")
+                notepad_window.activate()
                 time.sleep(1)
-                
-                print("Closing Notepad (Alt+F4)...")
-                pyautogui.hotkey('alt', 'f4')
+            else:
+                print("Warning: Could not find Notepad window, proceeding anyway...")
                 time.sleep(1)
-                
-                pyautogui.press('n')  
-                time.sleep(0.1)
-                
-                print(f"Successfully processed post {post['id']}")
-                
-            except Exception as e:
-                print(f"Error processing post {post['id']}: {e}")
+
+            print("Writing content...")
+            self.write_text_fast(content)
+            time.sleep(0.1)
+            
+            print("Saving file (Ctrl+S)...")
+            pyautogui.hotkey('ctrl', 's')
+            time.sleep(1)  
+            
+            if os.path.exists(filepath):
+                print(f"File exists, removing: {filepath}")
                 try:
-                    pyautogui.hotkey('alt', 'f4')
-                    time.sleep(0.1)
-                    pyautogui.press('n')
+                    os.remove(filepath)
                 except:
                     pass
-                continue
+            
+            print(f"Entering filepath: {filepath}")
+            pyautogui.hotkey('ctrl', 'a')  
+            time.sleep(0.1)
+            
+            pyperclip.copy(filepath)
+            pyautogui.hotkey('ctrl', 'v')
+            time.sleep(0.1)
+            
+            print("Pressing Enter to save...")
+            pyautogui.press('enter')
+            time.sleep(1)
+            
+            pyautogui.press('enter')  
+            time.sleep(1)
+            
+            print("Closing Notepad (Alt+F4)...")
+            pyautogui.hotkey('alt', 'f4')
+            time.sleep(1)
+            
+            pyautogui.press('n')  
+            time.sleep(0.1)
+            
+            if journal.is_done(filepath, digest):
+                journal.record(post['id'], digest, "done", file=filepath)
+                print(f"Successfully processed post {post['id']}")
+                return "done"
+            else:
+                journal.record(post['id'], digest, "failed", file=filepath,
+                               error="saved file missing or content mismatch")
+                print(f"Warning: {filepath} is missing or does not match post {post['id']}")
+                return "failed"
+            
+        except Exception as e:
+            print(f"Error processing post {post['id']}: {e}")
+            journal.record(post['id'], digest, "failed", file=filepath, error=str(e))
+            try:
+                pyautogui.hotkey('alt', 'f4')
+                time.sleep(0.1)
+                pyautogui.press('n')
+            except:
+                pass
+            return "failed"
+
+    def process_automation(self):
+        posts, is_fallback = self.fetch_posts()
+        
+        if not posts:
+            print("No posts to process!")
+            return
+        
+        if is_fallback:
+            print("\n⚠️  Using placeholder data due to API failure ⚠️\n")
+        
+        journal = RunJournal(os.path.join(TARGET_DIR, JOURNAL_FILENAME))
+        outcomes = {"done": 0, "skipped": 0, "failed": 0}
+        
+        for i, post in enumerate(posts, 1):
+            print(f"\n{'='*50}")
+            print(f"Processing Post {i}/{len(posts)} - ID: {post['id']}")
+            print(f"{'='*50}")
+            
+            status = self.process_post(post, journal)
+            outcomes[status] += 1
         
         print(f"\n{'='*50}")
         print("Automation completed!")
+        print(f"Saved: {outcomes['done']} | Skipped (already done): {outcomes['skipped']} | Failed: {outcomes['failed']}")
         print(f"Files saved to: {TARGET_DIR}")
         if is_fallback:
             print("⚠️  NOTE: Placeholder data was used due to API failure")